@@ -1,21 +1,173 @@
+import asyncio
+import math
+import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
 import sqlite3
-import json
+import orjson
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 from abc import ABC, abstractmethod
-import sys
-import time
+from concurrent.futures import Future
+import itertools
+import logging
+import operator
+import queue
+import threading
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_after_seconds(value):
+    """
+    Parse a Retry-After header, which is either a number of seconds or an HTTP date.
+    
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # Reject "inf"/"nan", which would otherwise sleep forever
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def writer_loop(write_queue):
+    """
+    Run queued database writes on the current thread until a None sentinel arrives.
+    
+    Each item is a (future, func, args) tuple; the future receives the result of
+    func(*args), or the exception it raised.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+        future, func, args = item
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(func(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
 
 class WarpAPI:
-    def __init__(self, base_url):
+    # Truncated exponential backoff for follower pages: min(cap, base * 2**attempt) + jitter
+    max_retries = 5
+    backoff_base = 0.5
+    backoff_cap = 60
+    backoff_jitter = 0.5
+
+    def __init__(self, base_url, concurrency=8, prefetch=8, write_queue_size=4):
         """
         Initialize the WarpAPI instance.
         
         Args:
             base_url (str): The base URL for the WarpCast API endpoint.
+            concurrency (int): Maximum number of follower page requests in flight at once.
+            prefetch (int): Number of follower pages buffered ahead of the database inserts.
+            write_queue_size (int): Number of pending database writes before fetchers wait on the writer.
         """
         self.base_url = base_url
         self.channels = []
         self.channel_dict = {}
+        self.prefetch = prefetch
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # SQLite connections must not be used from several threads at once, so all
+        # inserts go through a single writer thread. The bounded queue lets fetching run
+        # ahead of the writer by a few batches while capping how many rows sit in memory.
+        self._write_queue = queue.Queue(maxsize=write_queue_size)
+        self._writer = threading.Thread(target=writer_loop, args=(self._write_queue,),
+                                        name="sqlite-writer", daemon=True)
+        self._writer.start()
+        # Queue puts waiting in worker threads; aclose() waits for them before stopping the writer
+        self._pending_puts = set()
+        # Reuse pooled connections so repeated requests skip the TCP/TLS handshake,
+        # and let urllib3 retry transient failures with exponential backoff
+        retries = Retry(total=self.max_retries, backoff_factor=self.backoff_base,
+                        backoff_max=self.backoff_cap, backoff_jitter=self.backoff_jitter,
+                        status_forcelist=sorted(RETRYABLE_STATUSES), allowed_methods=["GET"],
+                        respect_retry_after_header=True)
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+
+    def close(self):
+        """
+        Release the pooled HTTP connections and the database writer thread.
+        """
+        self.session.close()
+        self._write_queue.put(None)
+        self._writer.join()
+
+    async def aclose(self):
+        """
+        Release resources from inside the event loop, once every fetch task has finished.
+        
+        Waits for queue puts still running in worker threads so none of them lands
+        after the writer's stop sentinel, then runs close() off the loop.
+        """
+        await asyncio.gather(*self._pending_puts, return_exceptions=True)
+        await asyncio.to_thread(self.close)
+
+    async def _submit_write(self, func, *args):
+        """
+        Queue func(*args) for the writer thread without blocking the event loop.
+        
+        Returns:
+            asyncio.Future: Resolves once the writer thread has run the call.
+        """
+        future = Future()
+        item = (future, func, args)
+        try:
+            self._write_queue.put_nowait(item)
+        except queue.Full:
+            # Wait for the writer to catch up in a worker thread rather than on the loop. The
+            # put can't be interrupted once started, so it is tracked until it completes and
+            # the write is cancelled if the caller goes away first.
+            put = asyncio.ensure_future(asyncio.to_thread(self._write_queue.put, item))
+            self._pending_puts.add(put)
+            put.add_done_callback(self._pending_puts.discard)
+            try:
+                await asyncio.shield(put)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+        return asyncio.wrap_future(future)
+
+    @staticmethod
+    def _raise_failed_writes(writes):
+        """
+        Raise the error of the first finished write that failed.
+        
+        Returns:
+            list: The writes that have not finished yet.
+        """
+        unfinished = []
+        for write in writes:
+            if write.done():
+                write.result()
+            else:
+                unfinished.append(write)
+        return unfinished
     
     def get_all_channels(self, limit=100):
         """
@@ -29,22 +181,31 @@ class WarpAPI:
         """
         url = f"{self.base_url}?allChannels=true&limit={limit}"
         try:
-            response = requests.get(url)
+            response = self.session.get(url, timeout=(5, 30))
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             self.channels = data.get("channels", [])
             # Sort channels by followerCount in descending order
-            self.channels.sort(key=lambda channel: channel.get('followerCount', 0), reverse=True)
+            # Default missing counts to 0 so the C-level itemgetter can be used as the sort key
+            for channel in self.channels:
+                channel.setdefault('followerCount', 0)
+            self.channels.sort(key=operator.itemgetter('followerCount'), reverse=True)
             return self.channels
-        except requests.RequestException as error:
-            print(f"Error fetching channels: {error}")
+        except (requests.RequestException, orjson.JSONDecodeError) as error:
+            logger.error("Error fetching channels: %s", error)
             return []
     
-    def get_channel_followers(self, channel_id, cursor=None):
+    async def get_channel_followers(self, client, channel_id, cursor=None):
         """
         Fetch a page of channel followers, with a retry mechanism.
         
+        Rate limiting (429), transient server errors (5xx), connection failures and
+        truncated bodies are retried with truncated exponential backoff plus jitter,
+        honoring Retry-After (capped at backoff_cap) when the server sends it. Other
+        HTTP errors are raised immediately.
+        
         Args:
+            client (aiohttp.ClientSession): The HTTP session shared across the run.
             channel_id (str): The ID of the channel.
             cursor (str): Pagination cursor, if available.
         
@@ -52,73 +213,141 @@ class WarpAPI:
             tuple: (followers list, next cursor)
             
         Raises:
-            requests.RequestException: If all retries fail.
+            aiohttp.ClientError: If the request fails permanently or all retries fail.
         """
         url = f'https://api.warpcast.com/v1/channel-followers?channelId={channel_id}'
         if cursor:
             url += f"&cursor={cursor}"
         
-        # Retry delays in seconds: 3, 5, 10, 60
-        delays = [3, 5, 10, 60]
-        attempt = 0
-        
-        while True:
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
             try:
-                response = requests.get(url)
-                response.raise_for_status()
-                data = response.json()
-                # Expecting follower data to look like:
-                # {"fid": 588495, "followedAt": 1742090574}
-                followers = data.get("result", {}).get("users", [])
-                next_cursor = data.get("next", {}).get("cursor")
-                return followers, next_cursor
-            except requests.RequestException as error:
-                if attempt < len(delays):
-                    wait_time = delays[attempt]
-                    print(f"Error fetching followers for channel {channel_id}: {error}. Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    attempt += 1
-                else:
-                    print("Failed after multiple retries.")
-                    raise error
-
-    def fetch_and_insert_followers_in_batches(self, channel_id, db, batch_size=100):
+                async with self._semaphore:
+                    async with client.get(url) as response:
+                        if response.status in RETRYABLE_STATUSES and attempt < self.max_retries:
+                            error = f"HTTP {response.status}"
+                            retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+                        else:
+                            response.raise_for_status()
+                            data = orjson.loads(await response.read())
+                            # Expecting follower data to look like:
+                            # {"fid": 588495, "followedAt": 1742090574}
+                            followers = data.get("result", {}).get("users", [])
+                            next_cursor = data.get("next", {}).get("cursor")
+                            return followers, next_cursor
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as exc:
+                if attempt == self.max_retries:
+                    logger.error("Failed after %d retries.", self.max_retries)
+                    raise
+                error = exc
+            if retry_after is None:
+                wait_time = min(self.backoff_cap, self.backoff_base * 2 ** attempt) + random.uniform(0, self.backoff_jitter)
+            else:
+                # Honor the server's hint, but never stall a channel longer than the backoff cap
+                wait_time = min(self.backoff_cap, retry_after)
+            logger.warning("Error fetching followers for channel %s: %s. Retrying in %.1f seconds...",
+                           channel_id, error, wait_time)
+            await asyncio.sleep(wait_time)
+
+    async def _produce_followers(self, client, channel_id, pages_queue):
+        """
+        Walk the follower pages of a channel and push (followers, cursor) tuples onto pages_queue.
+        
+        The next page is requested as soon as its cursor is known, so network I/O
+        overlaps with the consumer's database inserts. A final None is queued when
+        paging ends or fails so the consumer never waits on a finished producer.
+        """
+        cursor = None
+        try:
+            while True:
+                followers, cursor = await self.get_channel_followers(client, channel_id, cursor)
+                await pages_queue.put((followers, cursor))
+                if not cursor:
+                    break
+        except asyncio.CancelledError:
+            # Only the consumer cancels the producer, and it has stopped reading
+            raise
+        except Exception:
+            await pages_queue.put(None)
+            raise
+        await pages_queue.put(None)
+
+    async def fetch_and_insert_followers_in_batches(self, client, channel_id, db, batch_size=100, commit_every=10,
+                                                    progress=None):
         """
         Fetch followers for a given channel and insert them in batches into the database.
         
+        Batches share one transaction that is committed every `commit_every` batches
+        (bounding the WAL size) and once more after the final batch.
+        
         Args:
+            client (aiohttp.ClientSession): The HTTP session shared across the run.
             channel_id (str): The ID of the channel.
             db (Database): An instance of a Database (or subclass) to insert data.
             batch_size (int): The number of followers per batch.
+            commit_every (int): The number of batches written per transaction.
+            progress (tqdm, optional): Progress bar advanced by the number of followers downloaded.
         """
-        cursor = None
-        batch = []
-        while True:
-            followers, cursor = self.get_channel_followers(channel_id, cursor)
-            if followers:
-                batch.extend(followers)
-                # Overwrite the same line with the current batch size
-                sys.stdout.write(f"\rDownloading followers for channel {channel_id}: batch size is now {len(batch)}")
-                sys.stdout.flush()
-                # Once we've collected enough followers for a batch, insert them
-                if len(batch) >= batch_size:
-                    # Clear the line and print the insertion message
-                    sys.stdout.write("\r" + " " * 80 + "\r")
-                    print(f"Inserting batch of {len(batch)} followers for channel {channel_id}...")
-                    db.insert_followers_batch(channel_id, batch)
-                    batch = []  # Reset the batch
-            if not cursor:
-                # Insert any remaining followers in the final batch
-                if batch:
-                    sys.stdout.write("\r" + " " * 80 + "\r")
-                    print(f"Inserting final batch of {len(batch)} followers for channel {channel_id}...")
-                    db.insert_followers_batch(channel_id, batch)
-                break
+        pages_queue = asyncio.Queue(maxsize=self.prefetch)
+        producer = asyncio.create_task(self._produce_followers(client, channel_id, pages_queue))
+        # Writes run on the writer thread while fetching continues; finished ones are
+        # checked as we go so a failed insert stops the download early
+        writes = []
+        try:
+            # Pages are kept as-is and chained together at insert time rather than copied into one list
+            pages = []
+            pending = 0
+            batch_count = 0
+            while True:
+                page = await pages_queue.get()
+                if page is None:
+                    break
+                followers, cursor = page
+                if followers:
+                    pages.append(followers)
+                    pending += len(followers)
+                    if progress is not None:
+                        progress.update(len(followers))
+                    # Once we've collected enough followers for a batch, insert them
+                    if pending >= batch_size:
+                        writes = self._raise_failed_writes(writes)
+                        writes.append(await self._submit_write(db.insert_followers_batch, channel_id,
+                                                               itertools.chain.from_iterable(pages)))
+                        pages = []  # Reset the batch
+                        pending = 0
+                        batch_count += 1
+                        if batch_count % commit_every == 0:
+                            writes.append(await self._submit_write(db.commit))
+                            logger.info("Committing %d batches of followers for channel %s", batch_count, channel_id)
+            # Surface any error raised while paging before flushing the remainder
+            await producer
+            # Insert any remaining followers in the final batch
+            if pages:
+                writes.append(await self._submit_write(db.insert_followers_batch, channel_id,
+                                                       itertools.chain.from_iterable(pages)))
+            writes.append(await self._submit_write(db.commit))
+            # Wait until this channel's rows are committed, surfacing any database error
+            await asyncio.gather(*writes)
+        finally:
+            # On failure or cancellation, stop paging and let submitted writes settle so
+            # nothing is left running against the database
+            producer.cancel()
+            await asyncio.gather(producer, *writes, return_exceptions=True)
 
 # ------------------------------------------
 # Database Classes using OOP and Abstraction
 # ------------------------------------------
 
+INSERT_CHANNEL_SQL = """
+INSERT OR IGNORE INTO channels
+    (id, url, name, description, descriptionMentions, descriptionMentionsPositions,
+     imageUrl, headerImageUrl, leadFid, moderatorFids, createdAt, followerCount,
+     memberCount, publicCasting)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_FOLLOWER_SQL = "INSERT OR IGNORE INTO followers (channel_id, fid, followedAt) VALUES (?, ?, ?)"
+
 class Database(ABC):
     """
     Abstract base class defining the interface for a database.
@@ -135,6 +364,10 @@ class Database(ABC):
     def insert_channel(self, channel):
         pass
 
+    @abstractmethod
+    def insert_channels(self, channels):
+        pass
+
     @abstractmethod
     def insert_follower(self, channel_id, follower):
         pass
@@ -143,13 +376,17 @@ class Database(ABC):
     def insert_followers_batch(self, channel_id, followers):
         pass
 
+    @abstractmethod
+    def commit(self):
+        pass
+
 class SQLDatabase(Database):
     """
     SQL Database implementation using SQLite.
     
     This version creates:
       - A 'channels' table for channel details.
-      - For each channel, a separate followers table named "followers_<channel_id>".
+      - A single 'followers' table keyed by (channel_id, fid).
     """
     def __init__(self, db_path="channels.db"):
         self.db_path = db_path
@@ -158,8 +395,33 @@ class SQLDatabase(Database):
         self.create_tables()
 
     def connect(self):
-        self.conn = sqlite3.connect(self.db_path)
+        # Inserts run on WarpAPI's writer thread rather than the thread that opened the connection
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        # WAL lets commits append to a log instead of rewriting the database, and
+        # synchronous=NORMAL only fsyncs at checkpoints, so bulk inserts stop paying
+        # an fsync per commit.
+        self.conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        """)
+
+    def commit(self):
+        self.conn.commit()
+
+    def __enter__(self):
+        """
+        Group inserts into one transaction: `with db: db.insert_follower(...)`.
+        The transaction is committed on exit, or rolled back if an exception escapes.
+        """
+        self.conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self.conn.__exit__(exc_type, exc_value, traceback)
 
     def create_tables(self):
         # Create the channels table with fields corresponding to channel JSON structure
@@ -182,98 +444,95 @@ class SQLDatabase(Database):
         );
         """
         self.conn.execute(create_channels_query)
+        # One followers table for every channel. WITHOUT ROWID stores rows directly
+        # in the (channel_id, fid) primary key B-tree, and the fixed table name lets
+        # every insert reuse the same cached prepared statement.
+        create_followers_query = """
+        CREATE TABLE IF NOT EXISTS followers (
+            channel_id TEXT NOT NULL,
+            fid INTEGER NOT NULL,
+            followedAt INTEGER,
+            PRIMARY KEY (channel_id, fid)
+        ) WITHOUT ROWID;
+        """
+        self.conn.execute(create_followers_query)
         self.conn.commit()
 
+    @staticmethod
+    def _channel_row(channel):
+        """
+        Flatten a channel JSON object into the column order of INSERT_CHANNEL_SQL.
+        """
+        return (
+            channel.get("id"),
+            channel.get("url"),
+            channel.get("name"),
+            channel.get("description"),
+            orjson.dumps(channel.get("descriptionMentions", [])).decode(),
+            orjson.dumps(channel.get("descriptionMentionsPositions", [])).decode(),
+            channel.get("imageUrl"),
+            channel.get("headerImageUrl"),
+            channel.get("leadFid"),
+            orjson.dumps(channel.get("moderatorFids", [])).decode(),
+            channel.get("createdAt"),
+            channel.get("followerCount"),
+            channel.get("memberCount"),
+            1 if channel.get("publicCasting") else 0,
+        )
+
     def insert_channel(self, channel):
         """
         Insert a channel record if it does not already exist.
+        
+        Runs inside the open transaction; wrap calls in `with db:` to commit them.
         """
-        channel_id = channel.get("id")
-        cur = self.conn.execute("SELECT COUNT(*) FROM channels WHERE id=?", (channel_id,))
-        if cur.fetchone()[0] > 0:
-            print(f"Channel {channel_id} already exists. Skipping insertion.")
-            return
-        # Extract individual fields from the channel JSON
-        url = channel.get("url")
-        name = channel.get("name")
-        description = channel.get("description")
-        descriptionMentions = json.dumps(channel.get("descriptionMentions", []))
-        descriptionMentionsPositions = json.dumps(channel.get("descriptionMentionsPositions", []))
-        imageUrl = channel.get("imageUrl")
-        headerImageUrl = channel.get("headerImageUrl")
-        leadFid = channel.get("leadFid")
-        moderatorFids = json.dumps(channel.get("moderatorFids", []))
-        createdAt = channel.get("createdAt")
-        followerCount = channel.get("followerCount")
-        memberCount = channel.get("memberCount")
-        publicCasting = 1 if channel.get("publicCasting") else 0
-
-        query = """
-        INSERT INTO channels 
-            (id, url, name, description, descriptionMentions, descriptionMentionsPositions, 
-             imageUrl, headerImageUrl, leadFid, moderatorFids, createdAt, followerCount, 
-             memberCount, publicCasting)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        self.conn.execute(query, (channel_id, url, name, description, descriptionMentions,
-                                    descriptionMentionsPositions, imageUrl, headerImageUrl,
-                                    leadFid, moderatorFids, createdAt, followerCount,
-                                    memberCount, publicCasting))
-        self.conn.commit()
-        print(f"Inserted channel {channel_id} into channels table.")
+        cur = self.conn.execute(INSERT_CHANNEL_SQL, self._channel_row(channel))
+        if cur.rowcount:
+            logger.debug("Inserted channel %s into channels table.", channel.get("id"))
 
-    def create_followers_table(self, channel_id):
-        """
-        Create a followers table for the specified channel with columns matching the follower JSON.
+    def insert_channels(self, channels):
         """
-        table_name = f"followers_{channel_id}"
-        create_table_query = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            fid INTEGER PRIMARY KEY,
-            followedAt INTEGER
-        );
+        Insert many channel records in one transaction, skipping any that already exist.
+        
+        Returns:
+            int: The number of channels inserted.
         """
-        self.conn.execute(create_table_query)
-        self.conn.commit()
+        with self.conn:
+            cur = self.conn.executemany(INSERT_CHANNEL_SQL, (self._channel_row(channel) for channel in channels))
+        logger.debug("Inserted %d channels into channels table.", cur.rowcount)
+        return cur.rowcount
 
     def insert_follower(self, channel_id, follower):
         """
         Insert a single follower record if it does not already exist.
+        
+        Runs inside the open transaction; wrap calls in `with db:` to commit them.
         """
-        table_name = f"followers_{channel_id}"
-        self.create_followers_table(channel_id)
         fid = follower.get("fid")
         followedAt = follower.get("followedAt")
-        cur = self.conn.execute(f"SELECT COUNT(*) FROM {table_name} WHERE fid=?", (fid,))
-        if cur.fetchone()[0] > 0:
-            print(f"Follower {fid} already exists in table {table_name}. Skipping insertion.")
-            return
-        query = f"INSERT INTO {table_name} (fid, followedAt) VALUES (?, ?)"
-        self.conn.execute(query, (fid, followedAt))
-        self.conn.commit()
-        print(f"Inserted follower {fid} into table {table_name}.")
+        # The (channel_id, fid) primary key makes INSERT OR IGNORE skip existing followers
+        cur = self.conn.execute(INSERT_FOLLOWER_SQL, (channel_id, fid, followedAt))
+        if cur.rowcount:
+            logger.debug("Inserted follower %s for channel %s.", fid, channel_id)
 
     def insert_followers_batch(self, channel_id, followers):
         """
-        Insert a batch of followers into the followers table for the channel.
+        Insert a batch of followers for the channel into the followers table.
         Uses 'INSERT OR IGNORE' to avoid duplicate records.
+        
+        `followers` may be any iterable, including a generator; rows are built lazily
+        as SQLite consumes them.
+        
+        The batch is written inside the open transaction; call commit() to make it durable.
         """
-        table_name = f"followers_{channel_id}"
-        self.create_followers_table(channel_id)
-        data_to_insert = []
-        for follower in followers:
-            fid = follower.get("fid")
-            followedAt = follower.get("followedAt")
-            data_to_insert.append((fid, followedAt))
-        query = f"INSERT OR IGNORE INTO {table_name} (fid, followedAt) VALUES (?, ?)"
-        self.conn.executemany(query, data_to_insert)
-        self.conn.commit()
-        print(f"Inserted a batch of {len(data_to_insert)} followers into table {table_name}.")
+        rows = ((channel_id, follower.get("fid"), follower.get("followedAt")) for follower in followers)
+        cur = self.conn.executemany(INSERT_FOLLOWER_SQL, rows)
+        logger.debug("Inserted a batch of %d followers for channel %s.", cur.rowcount, channel_id)
 
 # ------------------------------------------
 # Example usage:
 # ------------------------------------------
-if __name__ == '__main__':
+async def main():
     # Instantiate the API client with your base URL
     api = WarpAPI("https://warpley.netlify.app/.netlify/functions/warpcast-api")
     
@@ -285,11 +544,33 @@ if __name__ == '__main__':
     # Create SQL database instance
     db = SQLDatabase("channels.db")
     
-    # Insert channels and their followers in batches
+    # Insert channels, then download their followers concurrently
+    db.insert_channels(channels[2:])
     for channel in channels[2:]:
-        db.insert_channel(channel)
         channel_id = channel.get("id")
         follower_count = channel.get("followerCount")
-        print(f"CHANNEL {channel_id} :: downloading followers :: {follower_count}")
-        # For each channel, fetch and insert followers in batches of 100
-        api.fetch_and_insert_followers_in_batches(channel_id, db, batch_size=1500)
+        logger.info("CHANNEL %s :: downloading followers :: %s", channel_id, follower_count)
+    total = sum(channel.get("followerCount") or 0 for channel in channels[2:])
+    try:
+        with logging_redirect_tqdm(), tqdm(total=total, unit="followers", desc="Downloading followers") as progress:
+            async with aiohttp.ClientSession() as client:
+                # For each channel, fetch and insert followers in batches of 1500
+                tasks = [
+                    asyncio.create_task(api.fetch_and_insert_followers_in_batches(
+                        client, channel.get("id"), db, batch_size=1500, progress=progress))
+                    for channel in channels[2:]
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                finally:
+                    # If one channel fails, stop the others and wait for them to wind down
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        # Every fetch task has finished by now, so no write can follow the writer's stop sentinel
+        await api.aclose()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main())
@@ -16,4 +16,5 @@ if __name__ == "__main__":
     api.display_casts()
     api.show_users_dataframe()
     api.show_edge_dataframe()
-    api.show_engagement_metrics_dataframe()
\ No newline at end of file
+    api.show_engagement_metrics_dataframe()
+    api.close()
\ No newline at end of file
@@ -1,4 +1,8 @@
+import operator
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class WarpAPI:
     def __init__(self, base_url):
@@ -12,6 +16,18 @@ class WarpAPI:
         self.base_url = base_url
         self.channels = []          # This attribute will hold the list of channels retrieved
         self.channel_dict = {}
+        # Reuse pooled connections so paging through followers skips the TCP/TLS handshake
+        retries = Retry(total=5, backoff_factor=0.5, backoff_jitter=0.5,
+                        status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"],
+                        respect_retry_after_header=True)
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+
+    def close(self):
+        """
+        Release the pooled HTTP connections.
+        """
+        self.session.close()
 
     def get_all_channels(self, limit=100):
         """
@@ -27,19 +43,22 @@ class WarpAPI:
         url = f"{self.base_url}?allChannels=true&limit={limit}"
     
         try:
-            response = requests.get(url)
+            response = self.session.get(url, timeout=(5, 30))
             response.raise_for_status()  # Raises an HTTPError if the response code was unsuccessful
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Store channels from the response in the class attribute
             self.channels = data.get("channels", [])
             
             # Sort the channels list by memberCount in ascending order
-            self.channels.sort(key=lambda channel: channel.get('followerCount', 0), reverse=True)
+            # Default missing counts to 0 so the C-level itemgetter can be used as the sort key
+            for channel in self.channels:
+                channel.setdefault('followerCount', 0)
+            self.channels.sort(key=operator.itemgetter('followerCount'), reverse=True)
             
             return self.channels
         
-        except requests.RequestException as error:
+        except (requests.RequestException, orjson.JSONDecodeError) as error:
             print(f"Error fetching channels: {error}")
             return []
     
@@ -49,9 +68,9 @@ class WarpAPI:
         if cursor:
             url += f"&cursor={cursor}"
             # params["cursor"] = cursor
-        response = requests.get(url)
+        response = self.session.get(url, timeout=(5, 30))
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         # Get the list of followers
         followers = data.get("result", {}).get("users", [])
         # Get the next cursor, if available
@@ -96,6 +115,7 @@ if __name__ == '__main__':
     # print("Retrieved Channels:")
     channel_id = "dev"
     api.download_all_channel_followers(channel_id)
+    api.close()
     
         
         
\ No newline at end of file
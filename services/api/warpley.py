@@ -1,22 +1,87 @@
+import io
+import multiprocessing
+import os
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from collections import defaultdict
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 import pandas as pd
 
-from tqdm import tqdm
-
 from services.nlp.nlp_processor import NLPProcessor
 
+# Number of NLP worker processes; 0 lets ProcessPoolExecutor use one per CPU. Each
+# worker holds its own copy of the models, so the default is kept small.
+NLP_WORKERS = int(os.environ.get("NLP_WORKERS", 2)) or None
+# Intra-op threads per worker, so the workers don't oversubscribe the CPUs between them
+NLP_WORKER_THREADS = int(os.environ.get("NLP_WORKER_THREADS", 1))
+
+
+def _load_models() -> None:
+    """Worker initializer: loads the NLP models once per process."""
+    NLPProcessor.load_models(num_threads=NLP_WORKER_THREADS)
+
+
+def _process_texts(texts: List[str]) -> List[Dict[str, Any]]:
+    """Worker task: analyzes one chunk of distinct, uncached cast texts as a single batch."""
+    return NLPProcessor.analyze_texts(texts)
+
+
 class WarpcastAPI:
+    # Shared across instances and created on first use, since each worker loads its own models
+    _executor: Optional[ProcessPoolExecutor] = None
+    # Casts sent to a worker at a time; large enough to keep model batches full
+    nlp_chunk_size = 64
+    _MENTION_RE = re.compile(r"@([a-zA-Z0-9_.]+)")
+    _CALLOUT_RE = re.compile(r"callout", re.IGNORECASE)
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        if cls._executor is None:
+            # Export the quantized model once here so the workers never race to write it
+            NLPProcessor.prepare_models()
+            # spawn rather than fork: forking after torch or the HTTP session have started
+            # threads can deadlock the children
+            cls._executor = ProcessPoolExecutor(max_workers=NLP_WORKERS, initializer=_load_models,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return cls._executor
+
+    @classmethod
+    def _shutdown_executor(cls) -> None:
+        """Stops the NLP worker processes; the pool is recreated on next use."""
+        if cls._executor is not None:
+            cls._executor.shutdown()
+            cls._executor = None
+
     def __init__(self, url: str):
         self.url = url
         self.data: List[Dict[str, Any]] = []
         self.user_database: Dict[str, Dict[str, Any]] = {}
-        self.edge_database: List[Dict[str, Any]] = []
+        # Users and edges are also kept column-wise so DataFrames can be built from
+        # the lists directly instead of from one dict per row
+        self._user_columns: Dict[str, List[Any]] = {"fid": [], "username": [], "display_name": [], "messages": []}
+        self.edge_database: Dict[str, List[Any]] = {"timestamp": [], "from": [], "to": [], "type": []}
+        # Rendered users DataFrame, rebuilt only after the user database changes
+        self._users_df: Optional[pd.DataFrame] = None
+        self._users_df_dirty = True
         self.engagement_metrics: Dict[str, Dict[str, int]] = defaultdict(lambda: {"likes": 0, "recasts": 0, "replies": 0, "total": 0})
+        # Reuse pooled connections across API calls instead of reconnecting per request
+        retries = Retry(total=5, backoff_factor=0.5, backoff_jitter=0.5,
+                        status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"],
+                        respect_retry_after_header=True)
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+
+    def close(self) -> None:
+        """Releases the pooled HTTP connections and stops the NLP worker processes."""
+        self.session.close()
+        self._shutdown_executor()
     
     def format_timestamp(self, timestamp) -> str:
         timestamp_sec = timestamp / 1000
@@ -26,14 +91,14 @@ class WarpcastAPI:
     def fetch_data(self) -> None:
         """Fetches data from the API and stores it in a list."""
         try:
-            response = requests.get(self.url)
+            response = self.session.get(self.url, timeout=(5, 30))
             response.raise_for_status()
             
-            json_data = response.json()
+            json_data = orjson.loads(response.content)
             print(json_data)
             # self.data = json_data.get("casts", [])
             # print(f"Fetched {len(self.data)} casts.")
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             print(f"Error fetching data: {e}")
     
     def fetch_all_channels(self, limit: int = 100) -> Dict[str, Any]:
@@ -49,88 +114,115 @@ class WarpcastAPI:
         """
         endpoint = f"{self.url}?allChannels=true&limit={limit}"
         try:
-            response = requests.get(endpoint)
+            response = self.session.get(endpoint, timeout=(5, 30))
             response.raise_for_status()
-            json_data = response.json()
+            json_data = orjson.loads(response.content)
             print("Fetched channels data:")
             print(json_data)
             return json_data
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             print(f"Error fetching channels: {e}")
             return {}
     
+    def _analyze_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyzes distinct texts in batched chunks spread over the worker processes.
+
+        A single chunk is analyzed in-process rather than paying for worker start-up.
+        """
+        chunks = [texts[i:i + self.nlp_chunk_size] for i in range(0, len(texts), self.nlp_chunk_size)]
+        if len(chunks) > 1:
+            try:
+                results = list(self._get_executor().map(_process_texts, chunks))
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); drop the pool so the next call starts a fresh one
+                self._shutdown_executor()
+                raise
+        else:
+            results = map(_process_texts, chunks)
+        return [analysis for chunk in results for analysis in chunk]
+
     def parse_casts(self) -> List[Dict[str, Any]]:
-        """Parses relevant fields from each cast."""
+        """Parses relevant fields from each cast and updates the user, edge and engagement data."""
         parsed_data = []
-        for cast in tqdm(self.data):
-            sentiment = NLPProcessor.analyze_sentiment(cast["text"])
-            emotion = NLPProcessor.detect_emotion(cast["text"])
-            topics = NLPProcessor.extract_topics(cast["text"])
-            
-            parsed_cast = {
-                "id": cast["id"],
+        # Texts analyzed before come from the NLP cache; the rest are analyzed once each
+        analyses = NLPProcessor.analyze_batch([cast["text"] for cast in self.data], analyze=self._analyze_texts)
+
+        # Single pass that also updates the user, edge and engagement stores. Each cast
+        # field and store is looked up once and bound to a local for the loop body.
+        user_database = self.user_database
+        user_columns = self._user_columns
+        edges = self.edge_database
+        engagement_metrics = self.engagement_metrics
+        find_mentions = self._MENTION_RE.findall
+        search_callout = self._CALLOUT_RE.search
+        for cast, analysis in zip(self.data, analyses):
+            cast_id = cast["id"]
+            author = cast["author"]
+            username = author["username"]
+            display_name = author["displayName"]
+            text = cast["text"]
+            timestamp = cast["timestamp"]
+            engagement = cast["engagement"]
+            parsed_data.append({
+                "id": cast_id,
                 "author": {
-                    "username": cast["author"]["username"],
-                    "displayName": cast["author"]["displayName"],
-                    "profileImage": cast["author"]["profileImage"],
+                    "username": username,
+                    "displayName": display_name,
+                    "profileImage": author["profileImage"],
                 },
-                "text": cast["text"],
-                "timestamp": cast["timestamp"],
-                "engagement": cast["engagement"],
-                "sentiment": sentiment,
-                "emotion": emotion,
-                "topics": topics,
-                "embeds": cast.get("embeds", {})
-            }
-            parsed_data.append(parsed_cast)
-            self.save_to_user_database(parsed_cast)
-            self.process_edge_relationships(parsed_cast)
-            self.track_engagement(parsed_cast)
-        return parsed_data
-    
-    def save_to_user_database(self, cast: Dict[str, Any]) -> None:
-        """Saves user data to the user database."""
-        author = cast["author"]
-        username = author["username"]
-        
-        if username not in self.user_database:
-            self.user_database[username] = {
-                "fid": cast["id"],
-                "name": username,
-                "display_name": author["displayName"],
-                "msg_count": 0,
-                "messages": []
-            }
-        
-        self.user_database[username]["messages"].append(cast["text"])
-        self.user_database[username]["msg_count"] += 1
-    
-    def process_edge_relationships(self, cast: Dict[str, Any]) -> None:
-        """Creates edge relationships based on mentions in text."""
-        author = cast["author"]["username"]
-        text = cast["text"]
-        timestamp = cast['timestamp']
-        mentions = re.findall(r"@([a-zA-Z0-9_.]+)", text)
-        
-        for mentioned_user in mentions:
-            relationship_type = "mention"
-            if text.startswith(f"@{mentioned_user}"):
-                relationship_type = "reply"
-            elif "callout" in text.lower():
-                relationship_type = "callout"
-            
-            self.edge_database.append({
+                "text": text,
                 "timestamp": timestamp,
-                "from": author,
-                "to": mentioned_user,
-                "type": relationship_type
+                "engagement": engagement,
+                "sentiment": analysis["sentiment"],
+                "emotion": analysis["emotion"],
+                "topics": analysis["topics"],
+                "embeds": cast.get("embeds", {})
             })
-    
-    def track_engagement(self, cast: Dict[str, Any]) -> None:
-        """Tracks engagement metrics for each user."""
-        username = cast["author"]["username"]
-        for key in ["likes", "recasts", "replies", "total"]:
-            self.engagement_metrics[username][key] += cast["engagement"].get(key, 0)
+
+            # User database
+            user = user_database.get(username)
+            if user is None:
+                user = user_database[username] = {
+                    "fid": cast_id,
+                    "name": username,
+                    "display_name": display_name,
+                    "msg_count": 0,
+                    # Newline-joined messages, accumulated as they arrive
+                    "_buf": io.StringIO()
+                }
+                user_columns["fid"].append(cast_id)
+                user_columns["username"].append(username)
+                user_columns["display_name"].append(display_name)
+                # Shares the buffer, so later messages show up in the column too
+                user_columns["messages"].append(user["_buf"])
+            if user["msg_count"]:
+                user["_buf"].write("\n")
+            user["_buf"].write(text)
+            user["msg_count"] += 1
+
+            # Edge relationships from mentions in the text
+            mentions = find_mentions(text)
+            if mentions:
+                is_callout = search_callout(text) is not None
+                for mentioned_user in mentions:
+                    relationship_type = "mention"
+                    if text.startswith(f"@{mentioned_user}"):
+                        relationship_type = "reply"
+                    elif is_callout:
+                        relationship_type = "callout"
+                    edges["timestamp"].append(timestamp)
+                    edges["from"].append(username)
+                    edges["to"].append(mentioned_user)
+                    edges["type"].append(relationship_type)
+
+            # Engagement metrics
+            metrics = engagement_metrics[username]
+            for key in ("likes", "recasts", "replies", "total"):
+                metrics[key] += engagement.get(key, 0)
+
+        if parsed_data:
+            self._users_df_dirty = True
+        return parsed_data
     
     def display_casts(self) -> None:
         """Displays the casts in a nicely formatted CLI text block."""
@@ -152,21 +244,21 @@ class WarpcastAPI:
 
     def show_users_dataframe(self):
         """Displays the users as a Pandas DataFrame."""
-        users_df = pd.DataFrame([
-            {
-                "fid": data["fid"],
-                "username": username,
-                "display_name": data["display_name"],
-                "messages": "\n".join(data["messages"])
-            }
-            for username, data in self.user_database.items()
-        ])
+        if self._users_df_dirty:
+            columns = self._user_columns
+            self._users_df = pd.DataFrame({
+                "fid": columns["fid"],
+                "username": columns["username"],
+                "display_name": columns["display_name"],
+                "messages": [buf.getvalue() for buf in columns["messages"]],
+            }, copy=False)
+            self._users_df_dirty = False
         print("Users Data")
-        print(users_df)
+        print(self._users_df)
 
     def show_edge_dataframe(self):
         """Displays the edges as a Pandas DataFrame."""
-        edges_df = pd.DataFrame(self.edge_database)
+        edges_df = pd.DataFrame(self.edge_database, copy=False)
         print("Edge Data")
         print(edges_df)
 
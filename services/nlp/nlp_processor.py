@@ -1,13 +1,137 @@
+import functools
+import importlib.util
+import os
+import platform
+import shutil
+import tempfile
 import textblob
-import spacy
-from transformers import pipeline
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 
-nlp = spacy.load("en_core_web_sm")
-emo_classifier = pipeline("text-classification", model="SamLowe/roberta-base-go_emotions", top_k=1)
+EMOTION_MODEL = "SamLowe/roberta-base-go_emotions"
+# Where the INT8 ONNX export of the emotion model is cached between runs
+QUANTIZED_EMOTION_MODEL_DIR = os.environ.get("EMOTION_MODEL_DIR", "roberta-ort-int8")
+# Parts of speech kept as topic keywords
+TOPIC_POS = frozenset({"NOUN", "PROPN"})
+# Analyses kept per text, so duplicate casts are only analyzed once
+NLP_CACHE_SIZE = int(os.environ.get("NLP_CACHE_SIZE", 100_000))
+# Intra-op threads for torch and ONNX Runtime; None leaves the library defaults
+_num_threads: Optional[int] = None
+# Recently analyzed texts, least recently used first
+_analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+@functools.cache
+def _get_spacy():
+    """Loads the spaCy model on first use.
+
+    Only the tagger, attribute ruler and lemmatizer are needed for topics, so the
+    dependency parser and NER are disabled. The attribute ruler stays enabled
+    because en_core_web_sm derives token.pos_ from it.
+    """
+    import spacy
+    return spacy.load("en_core_web_sm", disable=["parser", "ner"])
+
+
+@functools.cache
+def _get_emo():
+    """Loads the emotion classifier on first use."""
+    return _load_emotion_classifier()
+
+
+QUANTIZED_EMOTION_MODEL_FILE = "model_quantized.onnx"
+
+
+def export_quantized_emotion_model() -> bool:
+    """Exports and quantizes the emotion model to QUANTIZED_EMOTION_MODEL_DIR if it is not there yet.
+
+    The export is written to a temporary directory next to the target and moved into place
+    with os.replace, so an interrupted or concurrent export never leaves a half-written model
+    behind. Returns False when optimum[onnxruntime] is not installed.
+
+    Only checks for the exported file unless an export is needed, so callers that never run
+    the model (such as the parent of the worker pool) don't import torch and transformers.
+    """
+    # find_spec only locates the packages, it doesn't import them
+    if importlib.util.find_spec("optimum") is None or importlib.util.find_spec("onnxruntime") is None:
+        return False
+    target = os.path.abspath(QUANTIZED_EMOTION_MODEL_DIR)
+    if os.path.isfile(os.path.join(target, QUANTIZED_EMOTION_MODEL_FILE)):
+        return True
+
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    tmp_dir = tempfile.mkdtemp(prefix=".export-", dir=os.path.dirname(target))
+    try:
+        onnx_model = ORTModelForSequenceClassification.from_pretrained(EMOTION_MODEL, export=True)
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+        else:
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        ORTQuantizer.from_pretrained(onnx_model).quantize(save_dir=tmp_dir, quantization_config=qconfig)
+        AutoTokenizer.from_pretrained(EMOTION_MODEL).save_pretrained(tmp_dir)
+
+        # A directory without the model file is left over from an interrupted export
+        if os.path.isdir(target) and not os.path.isfile(os.path.join(target, QUANTIZED_EMOTION_MODEL_FILE)):
+            shutil.rmtree(target, ignore_errors=True)
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # Another process finished its export first; keep theirs
+            if not os.path.isfile(os.path.join(target, QUANTIZED_EMOTION_MODEL_FILE)):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return True
+
+
+def _load_emotion_classifier():
+    """Loads the emotion classifier, preferring a dynamically quantized INT8 ONNX Runtime model.
+
+    The model is exported and quantized on first use and reused from disk afterwards.
+    Falls back to the FP32 PyTorch pipeline when optimum[onnxruntime] is not installed.
+    """
+    from transformers import AutoTokenizer, pipeline
+    if not export_quantized_emotion_model():
+        return pipeline("text-classification", model=EMOTION_MODEL, top_k=1)
+
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    session_options = onnxruntime.SessionOptions()
+    if _num_threads is not None:
+        session_options.intra_op_num_threads = _num_threads
+    model = ORTModelForSequenceClassification.from_pretrained(QUANTIZED_EMOTION_MODEL_DIR,
+                                                              file_name=QUANTIZED_EMOTION_MODEL_FILE,
+                                                              session_options=session_options)
+    tokenizer = AutoTokenizer.from_pretrained(QUANTIZED_EMOTION_MODEL_DIR)
+    return pipeline("text-classification", model=model, tokenizer=tokenizer, top_k=1)
 
 
 class NLPProcessor:
+    @staticmethod
+    def load_models(num_threads: Optional[int] = None) -> None:
+        """Loads the spaCy and emotion models ahead of the first analysis call.
+
+        num_threads caps the intra-op threads torch and ONNX Runtime use in this process.
+        """
+        global _num_threads
+        if num_threads is not None:
+            _num_threads = num_threads
+            try:
+                import torch
+                torch.set_num_threads(num_threads)
+            except ImportError:
+                pass
+        _get_spacy()
+        _get_emo()
+
+    @staticmethod
+    def prepare_models() -> None:
+        """Writes the quantized emotion model to disk so worker processes only have to load it."""
+        export_quantized_emotion_model()
+    
     @staticmethod
     def analyze_sentiment(text: str) -> str:
         """Determines sentiment polarity (positive, neutral, negative)."""
@@ -22,15 +146,71 @@ class NLPProcessor:
     def detect_emotion(text: str) -> str:
         """Uses a Hugging Face transformer model to classify emotion."""
         try:
-            predictions = emo_classifier(text)
+            predictions = _get_emo()(text, truncation=True)
             return predictions[0][0]['label']
         except Exception as e:
             print(f"Emotion classification error: {e}")
             return "unknown"
     
     @staticmethod
-    def extract_topics(text: str) -> List[str]:
+    def detect_emotions(texts: List[str], batch_size: int = 32) -> List[str]:
+        """Classifies emotion for many texts in batched forward passes."""
+        if not texts:
+            return []
+        classifier = _get_emo()
+        try:
+            predictions = classifier(texts, batch_size=batch_size, truncation=True)
+            return [prediction[0]['label'] for prediction in predictions]
+        except Exception as e:
+            # Retry one text at a time so only the texts that fail become "unknown"
+            print(f"Emotion classification error: {e}; classifying the batch one text at a time")
+            return [NLPProcessor.detect_emotion(text) for text in texts]
+    
+    @staticmethod
+    def extract_topics(text: str) -> Tuple[str, ...]:
         """Extracts important topic keywords using NLP."""
-        doc = nlp(text)
-        topics = [token.lemma_ for token in doc if token.pos_ in {"NOUN", "PROPN"}]
-        return list(set(topics))
+        return next(NLPProcessor.extract_topics_batch([text]))
+    
+    @staticmethod
+    def extract_topics_batch(texts: Iterable[str], batch_size: int = 64) -> Iterator[Tuple[str, ...]]:
+        """Lazily yields topic keywords for each text, parsed in batches by spaCy's pipe."""
+        for doc in _get_spacy().pipe(texts, batch_size=batch_size):
+            yield tuple({token.lemma_ for token in doc if token.pos_ in TOPIC_POS})
+    
+    @staticmethod
+    def analyze_texts(texts: List[str]) -> List[Dict[str, Any]]:
+        """Runs sentiment, emotion and topic analysis over distinct texts, bypassing the cache."""
+        emotions = NLPProcessor.detect_emotions(texts)
+        topics = NLPProcessor.extract_topics_batch(texts)
+        return [
+            {"sentiment": NLPProcessor.analyze_sentiment(text), "emotion": emotion, "topics": topic_list}
+            for text, emotion, topic_list in zip(texts, emotions, topics)
+        ]
+
+    @staticmethod
+    def analyze_batch(texts: List[str],
+                      analyze: Optional[Callable[[List[str]], List[Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
+        """Runs sentiment, emotion and topic analysis over many texts at once.
+
+        Results are cached per text, so repeated texts are analyzed once, within a call and
+        across calls. Only the distinct uncached texts are passed to analyze (analyze_texts
+        by default), which lets callers spread them over worker processes.
+        """
+        analysis_by_text = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            analysis = _analysis_cache.get(text)
+            if analysis is None:
+                misses.append(text)
+            else:
+                _analysis_cache.move_to_end(text)
+                analysis_by_text[text] = analysis
+        if misses:
+            for text, analysis in zip(misses, (analyze or NLPProcessor.analyze_texts)(misses)):
+                analysis_by_text[text] = analysis
+                # A failed emotion classification is not cached, so it is retried next time
+                if analysis["emotion"] != "unknown":
+                    _analysis_cache[text] = analysis
+            while len(_analysis_cache) > NLP_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+        return [analysis_by_text[text] for text in texts]